@@ -3,24 +3,31 @@ Main Flask application file for the AI Resume Analyzer.
 """
 import os
 import time
+import atexit
 import logging
 import json
 from datetime import datetime
 from flask import Flask, request, jsonify, send_from_directory, render_template
+from flask import json as flask_json
 from flask_cors import CORS
 from werkzeug.exceptions import RequestEntityTooLarge
+from sqlalchemy import func
 
 from config import Config
 from utils.file_handlers import (
     allowed_file, 
     save_file, 
-    extract_text, 
-    get_file_extension, 
-    sanitize_text
+    extract_normalized_text, 
+    get_file_extension
 )
 from utils.rate_limiter import RateLimiter, rate_limit
 from utils.db import Database
-from models.resume import Resume
+from utils.write_batcher import WriteBatcher
+from utils.minhash import compute_signature, signature_from_bytes, signature_to_bytes
+from utils.duplicates import DuplicateIndex
+from utils.response_cache import ResponseCache
+from utils.term_index import index_resume_terms, delete_resume_terms
+from models.resume import Resume, make_text_preview
 
 # Configure logging
 logging.basicConfig(
@@ -45,6 +52,112 @@ rate_limiter = RateLimiter(app.config['RATE_LIMIT_PER_MINUTE'])
 db = Database(app.config['DATABASE_URI'])
 db.create_tables()
 
+# Optional group-commit writer for inserts and status updates
+write_batcher = None
+if app.config['WRITE_BATCHING_ENABLED']:
+    write_batcher = WriteBatcher(
+        db.session_factory,
+        interval_ms=app.config['WRITE_BATCH_INTERVAL_MS'],
+        max_rows=app.config['WRITE_BATCH_MAX_ROWS']
+    )
+    atexit.register(write_batcher.close)
+
+# Near-duplicate index, filled lazily from stored signatures
+duplicate_index = DuplicateIndex()
+
+# Cache of read endpoint responses, invalidated by the write endpoints
+response_cache = ResponseCache(
+    max_entries=app.config['RESPONSE_CACHE_SIZE'],
+    ttl=app.config['RESPONSE_CACHE_TTL']
+)
+RESUMES_CACHE_KEY = 'resumes'
+
+def resume_cache_key(resume_id):
+    """Cache key for a single resume response."""
+    return ('resume', resume_id)
+
+def resumes_validator():
+    """Validator for the resume list: changes on every insert, delete and update."""
+    session = db.get_session()
+    try:
+        return tuple(session.query(
+            func.count(Resume.id), func.max(Resume.id), func.max(Resume.updated_at)
+        ).one())
+    finally:
+        session.close()
+
+def resume_validator(resume_id):
+    """Validator for a single resume: its updated_at, or None once deleted."""
+    session = db.get_session()
+    try:
+        row = session.query(Resume.updated_at).filter(Resume.id == resume_id).first()
+        return tuple(row) if row is not None else None
+    finally:
+        session.close()
+
+def conditional_json(cache_key, validate, load):
+    """
+    Serve a JSON payload from the response cache with an ETag.
+    
+    The ETag covers the serialized payload, including each row's
+    updated_at. Last-Modified is deliberately not sent: it has one-second
+    resolution and cannot reflect deleted rows, so If-Modified-Since alone
+    could return stale 304s.
+    
+    The validator is read before the payload, so a change committed in
+    between leaves a mismatched entry that the next poll reloads.
+    
+    Args:
+        cache_key: Response cache key
+        validate: Callable returning a cheap value that changes whenever
+            the payload does, including changes made by other processes
+        load: Callable returning the payload, or None if the resource does
+            not exist
+        
+    Returns:
+        A 200 or 304 response, or None if load found nothing
+    """
+    validator = validate()
+    entry = response_cache.get(cache_key, validator)
+    if entry is None:
+        generation = response_cache.generation
+        loaded = load()
+        if loaded is None:
+            return None
+        entry = response_cache.set(cache_key, flask_json.dumps(loaded), generation, validator)
+    
+    response = app.response_class(entry.body, mimetype='application/json')
+    response.set_etag(entry.etag)
+    # Clients may keep the response but must revalidate it on every poll
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+def execute_write(operation):
+    """
+    Run a write operation and commit it.
+
+    Uses the group-commit writer when enabled, otherwise commits the
+    operation in its own session.
+
+    Args:
+        operation: Callable taking a session and returning a result
+
+    Returns:
+        The operation's result once committed
+    """
+    if write_batcher is not None:
+        return write_batcher.submit(operation).result()
+    session = db.session_factory()
+    try:
+        result = operation(session)
+        session.commit()
+        return result
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
 # Error handlers
 @app.errorhandler(404)
 def not_found(error):
@@ -130,33 +243,37 @@ def upload_resume():
     file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
     file_type = get_file_extension(filename)
     
-    # Extract text from file
-    raw_text = extract_text(file_path, file_type)
-    if raw_text.startswith('Error'):
-        logger.error(raw_text)
+    # Extract text from file, sanitizing and normalizing it page by page
+    success, sanitized_text, normalized_text = extract_normalized_text(file_path, file_type)
+    if not success:
+        logger.error(sanitized_text)
         return jsonify({
             'status': 'error',
-            'message': raw_text
+            'message': sanitized_text
         }), 500
     
-    # Sanitize text
-    sanitized_text = sanitize_text(raw_text)
+    minhash = signature_to_bytes(compute_signature(sanitized_text))
     
     # Store in database
-    try:
-        session = db.get_session()
+    def insert_resume(session):
         new_resume = Resume(
             filename=filename,
             file_type=file_type,
             upload_date=datetime.utcnow(),
             raw_text=sanitized_text,
+            normalized_text=normalized_text,
             status='uploaded',
-            metadata={}
+            resume_metadata={},
+            minhash=minhash
         )
         session.add(new_resume)
-        session.commit()
-        resume_id = new_resume.id
-        session.close()
+        session.flush()
+        index_resume_terms(session, new_resume.id, sanitized_text)
+        return new_resume.id
+
+    try:
+        resume_id = execute_write(insert_resume)
+        response_cache.invalidate(RESUMES_CACHE_KEY)
     except Exception as e:
         logger.error(f"Database error: {str(e)}")
         return jsonify({
@@ -172,22 +289,25 @@ def upload_resume():
         'filename': filename,
         'file_type': file_type,
         'upload_timestamp': datetime.utcnow().isoformat(),
-        'text_preview': sanitized_text[:150] + '...' if len(sanitized_text) > 150 else sanitized_text
+        'text_preview': make_text_preview(sanitized_text)
     }), 201
 
 @app.route('/resumes', methods=['GET'])
 def get_resumes():
     """Get all resumes."""
-    try:
+    def load_resumes():
         session = db.get_session()
         resumes = session.query(Resume).all()
         result = [resume.to_dict() for resume in resumes]
         session.close()
-        return jsonify({
+        return {
             'status': 'success',
             'count': len(result),
             'resumes': result
-        })
+        }
+    
+    try:
+        return conditional_json(RESUMES_CACHE_KEY, resumes_validator, load_resumes)
     except Exception as e:
         logger.error(f"Error retrieving resumes: {str(e)}")
         return jsonify({
@@ -199,26 +319,91 @@ def get_resumes():
 @app.route('/resume/<int:resume_id>', methods=['GET'])
 def get_resume(resume_id):
     """Get a specific resume by ID."""
-    try:
+    def load_resume():
         session = db.get_session()
         resume = session.query(Resume).filter(Resume.id == resume_id).first()
         session.close()
+        if resume is None:
+            return None
+        return {
+            'status': 'success',
+            'resume': resume.to_dict()
+        }
+    
+    try:
+        response = conditional_json(
+            resume_cache_key(resume_id), lambda: resume_validator(resume_id), load_resume
+        )
+        if response is None:
+            return jsonify({
+                'status': 'error',
+                'message': f'Resume with ID {resume_id} not found'
+            }), 404
+        return response
+    except Exception as e:
+        logger.error(f"Error retrieving resume {resume_id}: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': f'Error retrieving resume {resume_id}',
+            'details': str(e)
+        }), 500
+
+@app.route('/resume/<int:resume_id>/duplicates', methods=['GET'])
+def get_resume_duplicates(resume_id):
+    """Find near-duplicates of a resume using MinHash/LSH."""
+    try:
+        threshold = float(request.args.get('threshold', 0.8))
+    except ValueError:
+        threshold = -1.0
+    if not 0.0 <= threshold <= 1.0:
+        return jsonify({
+            'status': 'error',
+            'message': 'threshold must be a number between 0 and 1'
+        }), 400
+    
+    try:
+        session = db.get_session()
+        resume = session.query(Resume).filter(Resume.id == resume_id).first()
         
         if resume is None:
+            session.close()
             return jsonify({
                 'status': 'error',
                 'message': f'Resume with ID {resume_id} not found'
             }), 404
         
+        if resume.minhash is not None:
+            signature = signature_from_bytes(resume.minhash)
+        else:
+            signature = compute_signature(resume.raw_text)
+        
+        # A resume without any text to compare has no duplicates
+        matches = []
+        if signature is not None:
+            duplicate_index.sync(session)
+            matches = duplicate_index.find(resume_id, signature, threshold)
+        
+        # Look up matches in the database so resumes deleted elsewhere are skipped
+        similarity_by_id = dict(matches)
+        rows = session.query(Resume).filter(Resume.id.in_(list(similarity_by_id))).all() if matches else []
+        session.close()
+        
+        duplicates = sorted(
+            (dict(row.to_dict(), similarity=round(similarity_by_id[row.id], 4)) for row in rows),
+            key=lambda item: (-item['similarity'], item['id'])
+        )
         return jsonify({
             'status': 'success',
-            'resume': resume.to_dict()
+            'resume_id': resume_id,
+            'threshold': threshold,
+            'count': len(duplicates),
+            'duplicates': duplicates
         })
     except Exception as e:
-        logger.error(f"Error retrieving resume {resume_id}: {str(e)}")
+        logger.error(f"Error finding duplicates of resume {resume_id}: {str(e)}")
         return jsonify({
             'status': 'error',
-            'message': f'Error retrieving resume {resume_id}',
+            'message': f'Error finding duplicates of resume {resume_id}',
             'details': str(e)
         }), 500
 
@@ -243,8 +428,11 @@ def delete_resume(resume_id):
         
         # Delete from database
         session.delete(resume)
+        delete_resume_terms(session, resume_id)
         session.commit()
         session.close()
+        response_cache.invalidate(RESUMES_CACHE_KEY, resume_cache_key(resume_id))
+        duplicate_index.remove(resume_id)
         
         return jsonify({
             'status': 'success',
@@ -271,23 +459,23 @@ def update_resume_status(resume_id):
         
         new_status = data['status']
         
-        session = db.get_session()
-        resume = session.query(Resume).filter(Resume.id == resume_id).first()
+        def apply_status(session):
+            resume = session.query(Resume).filter(Resume.id == resume_id).first()
+            if resume is None:
+                return False
+            resume.status = new_status
+            if 'metadata' in data:
+                resume.resume_metadata = data['metadata']
+            return True
         
-        if resume is None:
-            session.close()
+        updated = execute_write(apply_status)
+        response_cache.invalidate(RESUMES_CACHE_KEY, resume_cache_key(resume_id))
+        if not updated:
             return jsonify({
                 'status': 'error',
                 'message': f'Resume with ID {resume_id} not found'
             }), 404
         
-        resume.status = new_status
-        if 'metadata' in data:
-            resume.metadata = data['metadata']
-        
-        session.commit()
-        session.close()
-        
         return jsonify({
             'status': 'success',
             'message': f'Resume status updated to {new_status}'
@@ -300,5 +488,56 @@ def update_resume_status(resume_id):
             'details': str(e)
         }), 500
 
+# Maximum number of ids bound into a single UPDATE ... IN (...) statement
+BULK_UPDATE_CHUNK_SIZE = 500
+
+@app.route('/resumes/status', methods=['PUT'])
+def update_resumes_status():
+    """Update the status of many resumes in a single statement."""
+    try:
+        data = request.get_json()
+        if not data or 'status' not in data or 'ids' not in data:
+            return jsonify({
+                'status': 'error',
+                'message': 'Fields ids and status are required'
+            }), 400
+        
+        ids = data['ids']
+        if not isinstance(ids, list) or not all(
+            isinstance(i, int) and not isinstance(i, bool) for i in ids
+        ):
+            return jsonify({
+                'status': 'error',
+                'message': 'ids must be a list of integers'
+            }), 400
+        
+        new_status = data['status']
+        
+        def apply_bulk_status(session):
+            # Chunk the IN list to stay under the database's bound-parameter limit
+            updated = 0
+            for start in range(0, len(ids), BULK_UPDATE_CHUNK_SIZE):
+                chunk = ids[start:start + BULK_UPDATE_CHUNK_SIZE]
+                updated += session.query(Resume).filter(Resume.id.in_(chunk)).update(
+                    {Resume.status: new_status}, synchronize_session=False
+                )
+            return updated
+        
+        updated = execute_write(apply_bulk_status)
+        response_cache.invalidate(RESUMES_CACHE_KEY, *(resume_cache_key(i) for i in ids))
+        
+        return jsonify({
+            'status': 'success',
+            'updated': updated,
+            'message': f'{updated} resume(s) updated to {new_status}'
+        })
+    except Exception as e:
+        logger.error(f"Error updating resume statuses: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': 'Error updating resume statuses',
+            'details': str(e)
+        }), 500
+
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
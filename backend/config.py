@@ -16,6 +16,13 @@ class Config:
     MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', 10 * 1024 * 1024))  # Default 10MB
     RATE_LIMIT_PER_MINUTE = int(os.getenv('RATE_LIMIT_PER_MINUTE', 10))
     ALLOWED_EXTENSIONS = {'pdf', 'docx'}
+    # Group-commit writes from concurrent requests into shared transactions
+    WRITE_BATCHING_ENABLED = os.getenv('WRITE_BATCHING_ENABLED', 'false').lower() == 'true'
+    WRITE_BATCH_INTERVAL_MS = int(os.getenv('WRITE_BATCH_INTERVAL_MS', 10))
+    WRITE_BATCH_MAX_ROWS = int(os.getenv('WRITE_BATCH_MAX_ROWS', 100))
+    # Server-side cache of read endpoint responses
+    RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', 256))
+    RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', 60))  # seconds
 
     @staticmethod
     def init_app(app):
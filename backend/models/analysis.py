@@ -0,0 +1,53 @@
+"""
+Database models for skill taxonomy snapshots and re-analysis jobs.
+"""
+from sqlalchemy import Column, Integer, String, DateTime, JSON
+from datetime import datetime
+
+from models.resume import Base
+
+
+class TaxonomySnapshot(Base):
+    """Skill taxonomy that stored resume analyses were computed against."""
+    __tablename__ = 'taxonomy_snapshots'
+
+    id = Column(Integer, primary_key=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    skills = Column(JSON, nullable=False)
+
+    def __repr__(self):
+        return f"<TaxonomySnapshot(id={self.id}, skills={len(self.skills or [])})>"
+
+
+class ReanalysisJob(Base):
+    """Progress of an incremental re-analysis after a taxonomy change."""
+    __tablename__ = 'reanalysis_jobs'
+
+    id = Column(Integer, primary_key=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    from_snapshot_id = Column(Integer, nullable=False)
+    to_snapshot_id = Column(Integer, nullable=False)
+    added_skills = Column(JSON, nullable=False)
+    removed_skills = Column(JSON, nullable=False)
+    # Candidates are processed in id order; this is the resume position
+    last_resume_id = Column(Integer, nullable=False, default=0)
+    processed = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=False, default=0)
+    status = Column(String(20), nullable=False, default='running')
+
+    def __repr__(self):
+        return f"<ReanalysisJob(id={self.id}, status='{self.status}', processed={self.processed}/{self.total})>"
+
+    def to_dict(self):
+        """Convert the model instance to a dictionary."""
+        return {
+            'id': self.id,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'added_skills': self.added_skills,
+            'removed_skills': self.removed_skills,
+            'processed': self.processed,
+            'total': self.total,
+            'status': self.status
+        }
@@ -1,12 +1,26 @@
 """
 Database models for the Resume Analyzer application.
 """
-from sqlalchemy import Column, Integer, String, DateTime, Text, Index, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Index, JSON, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import deferred, validates
 from datetime import datetime
 
+from models.types import CompressedText
+
 Base = declarative_base()
 
+# Number of characters of the resume text kept uncompressed for listings
+PREVIEW_LENGTH = 150
+
+
+def make_text_preview(text):
+    """Build the short uncompressed preview shown in listings."""
+    if text and len(text) > PREVIEW_LENGTH:
+        return text[:PREVIEW_LENGTH] + '...'
+    return text
+
+
 class Resume(Base):
     """Resume model for storing uploaded resume information."""
     __tablename__ = 'resumes'
@@ -15,19 +29,41 @@ class Resume(Base):
     filename = Column(String(255), nullable=False)
     file_type = Column(String(10), nullable=False)
     upload_date = Column(DateTime, nullable=False, default=datetime.utcnow)
-    raw_text = Column(Text, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Full text is compressed and deferred so listing queries never load it
+    raw_text = deferred(Column(CompressedText(), nullable=False))
+    text_preview = Column(String(PREVIEW_LENGTH + 3))
+    # Analysis-ready form of raw_text (lowercased and cleaned), saved at upload
+    normalized_text = deferred(Column(CompressedText()))
     status = Column(String(20), default='pending')
     resume_metadata = Column(JSON)
+    # MinHash signature of the text for near-duplicate detection
+    minhash = deferred(Column(LargeBinary))
+    # Stored output of analyze_resume, kept current by utils.reanalysis
+    analysis = deferred(Column(JSON(none_as_null=True)))
 
     # Create indexes for frequently queried columns
     __table_args__ = (
         Index('idx_filename', filename),
         Index('idx_upload_date', upload_date),
+        # Keeps max(updated_at) for response cache validation cheap
+        Index('idx_updated_at', updated_at),
     )
 
+    @validates('raw_text')
+    def _update_text_preview(self, key, value):
+        """Keep the uncompressed preview in sync with the full text."""
+        self.text_preview = make_text_preview(value)
+        return value
+
+    @property
+    def last_modified(self):
+        """When the row last changed; rows predating updated_at fall back to upload_date."""
+        return self.updated_at or self.upload_date
+
     def __repr__(self):
         return f"<Resume(id={self.id}, filename='{self.filename}', status='{self.status}')>"
-    
+
     def to_dict(self):
         """Convert the model instance to a dictionary."""
         return {
@@ -35,7 +71,23 @@ class Resume(Base):
             'filename': self.filename,
             'file_type': self.file_type,
             'upload_date': self.upload_date.isoformat() if self.upload_date else None,
+            'updated_at': self.last_modified.isoformat() if self.last_modified else None,
             'status': self.status,
-            'text_preview': (self.raw_text[:150] + '...') if self.raw_text and len(self.raw_text) > 150 else self.raw_text,
+            'text_preview': self.text_preview,
             'metadata': self.resume_metadata
-        }
\ No newline at end of file
+        }
+
+
+class ResumeTerm(Base):
+    """Distinct word token of a resume, used to pre-filter re-analysis."""
+    __tablename__ = 'resume_terms'
+
+    term = Column(String(64), primary_key=True)
+    resume_id = Column(Integer, primary_key=True)
+
+    __table_args__ = (
+        Index('idx_resume_terms_resume_id', resume_id),
+    )
+
+    def __repr__(self):
+        return f"<ResumeTerm(term='{self.term}', resume_id={self.resume_id})>"
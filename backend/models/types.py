@@ -0,0 +1,44 @@
+"""
+Custom SQLAlchemy column types for the Resume Analyzer application.
+"""
+import zlib
+
+from sqlalchemy.types import TypeDecorator, LargeBinary
+
+
+class _LegacyTolerantBinary(LargeBinary):
+    """Binary type that passes through text values left by older schemas."""
+
+    def result_processor(self, dialect, coltype):
+        def process(value):
+            if value is None or isinstance(value, str):
+                return value
+            return bytes(value)
+        return process
+
+
+class CompressedText(TypeDecorator):
+    """
+    Unicode text stored zlib-compressed in a binary column.
+
+    Values are compressed on write and decompressed on read, so the mapped
+    attribute behaves like a plain ``Text`` column. Rows written before the
+    column was compressed are returned unchanged until they are migrated
+    (see ``utils.migrations.compress_raw_text``).
+    """
+    impl = _LegacyTolerantBinary
+    cache_ok = True
+
+    def __init__(self, level=6, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.level = level
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return zlib.compress(value.encode('utf-8'), self.level)
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, str):
+            return value
+        return zlib.decompress(value).decode('utf-8')
@@ -0,0 +1,7 @@
+"""
+Test configuration: make the backend modules importable as the app does.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,79 @@
+"""
+Tests for the bulk status endpoint, PUT /resumes/status.
+"""
+import importlib
+
+import pytest
+from sqlalchemy import event
+
+from models.resume import Resume
+
+
+@pytest.fixture(scope='module')
+def app_module(tmp_path_factory):
+    from config import Config
+
+    tmp = tmp_path_factory.mktemp('app')
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(Config, 'DATABASE_URI', f"sqlite:///{tmp / 'app.db'}")
+        mp.setattr(Config, 'UPLOAD_FOLDER', str(tmp / 'uploads'))
+        mp.setattr(Config, 'WRITE_BATCHING_ENABLED', False)
+        yield importlib.import_module('app')
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
+
+
+def add_resumes(app_module, count):
+    session = app_module.db.session_factory()
+    try:
+        resumes = [
+            Resume(filename=f'{i}.pdf', file_type='pdf', raw_text=f'resume {i}', status='uploaded')
+            for i in range(count)
+        ]
+        session.add_all(resumes)
+        session.commit()
+        return [resume.id for resume in resumes]
+    finally:
+        session.close()
+
+
+def record_updates(statements):
+    """Cursor listener collecting UPDATE statements on resumes."""
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('UPDATE resumes'):
+            statements.append(statement)
+    return before_cursor_execute
+
+
+def test_bulk_status_update_is_chunked(app_module, client):
+    chunk_size = app_module.BULK_UPDATE_CHUNK_SIZE
+    ids = add_resumes(app_module, chunk_size * 2 + 1)
+    # Ids that match no row are counted out, not rejected
+    missing = [max(ids) + 1000]
+
+    statements = []
+    listener = record_updates(statements)
+    event.listen(app_module.db.engine, 'before_cursor_execute', listener)
+    try:
+        response = client.put('/resumes/status', json={'ids': ids + missing, 'status': 'reviewed'})
+    finally:
+        event.remove(app_module.db.engine, 'before_cursor_execute', listener)
+
+    assert response.status_code == 200
+    assert response.get_json()['updated'] == len(ids)
+    assert len(statements) == 3
+    session = app_module.db.session_factory()
+    try:
+        statuses = {status for status, in session.query(Resume.status).filter(Resume.id.in_(ids))}
+    finally:
+        session.close()
+    assert statuses == {'reviewed'}
+
+
+@pytest.mark.parametrize('ids', ['1,2', [1, 'two'], [True, 2], None])
+def test_bulk_status_rejects_invalid_ids(client, ids):
+    response = client.put('/resumes/status', json={'ids': ids, 'status': 'reviewed'})
+    assert response.status_code == 400
@@ -0,0 +1,117 @@
+"""
+Differential tests: streaming normalization must be byte-identical to the
+original whole-string regex passes, kept inline below as the reference.
+"""
+import random
+import re
+
+import pytest
+
+from utils.file_handlers import sanitize_text
+from utils.text_normalization import normalize, normalize_chunks, sanitize
+
+
+def reference_sanitize_text(text):
+    """file_handlers.sanitize_text before the streaming rewrite."""
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'[^\w\s.\-,;:()\[\]{}\'\"?!@#$%^&*+=]', '', text)
+    return text.strip()
+
+
+def reference_clean_text(text):
+    """resume_analysis.clean_text before the streaming rewrite."""
+    text = text.lower()
+    text = re.sub(r'[^\w\s\-.,;:()\[\]{}\'\"?!@#$%^&*+=]', '', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+# Characters that stress chunk boundaries: Unicode whitespace, the Greek
+# capital sigma (lowercased by context), dotted capital I (lowercases to two
+# code points), emoji and disallowed punctuation next to spaces.
+ALPHABET = [
+    'a', 'Z', '_', '7', ' ', '\t', '\n', '\r', '\x0b', '\x0c', '\x85',
+    '\xa0', ' ', '　', '​',
+    'Σ', 'σ', 'ς', 'Α', 'Ο', 'Δ', 'İ', 'ẞ', 'ß', 'é',
+    '😀', '•', '–', '—', '·', "'", '.', ':', ';', '-', '+', '=',
+    'ΟΔΟΣ', 'ΑΣ ', ' Σ ', 'ΣΑ', ' • ',
+]
+
+CASES = [
+    '',
+    '   ',
+    'Hello  World',
+    '  leading and trailing  ',
+    'a • b',
+    'ΟΔΟΣ ΟΔΟΣ.',
+    'ΑΣ\nΣΑ',
+    'İstanbul İİ',
+    'emoji 😀 in 😀😀 text',
+    '　ideographic　space line para\x85next',
+    'C++ / Node.js — 5+ years • AWS',
+]
+
+SEED = 20240601
+RANDOM_CASES = 5000
+
+
+def random_text(rng):
+    return ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 40)))
+
+
+def random_chunks(rng, text):
+    """Split text at random positions, including empty chunks."""
+    cuts = sorted(rng.randint(0, len(text)) for _ in range(rng.randint(0, 6)))
+    bounds = [0] + cuts + [len(text)]
+    return [text[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+def corpus():
+    rng = random.Random(SEED)
+    texts = list(CASES)
+    texts.extend(random_text(rng) for _ in range(RANDOM_CASES))
+    return [(text, random_chunks(rng, text)) for text in texts]
+
+
+CORPUS = corpus()
+
+
+def test_sanitize_text_matches_reference():
+    for text, _ in CORPUS:
+        assert sanitize_text(text) == reference_sanitize_text(text), repr(text)
+        assert sanitize(text) == reference_sanitize_text(text), repr(text)
+
+
+def test_normalize_matches_reference_clean_text():
+    for text, _ in CORPUS:
+        assert normalize(text) == reference_clean_text(text), repr(text)
+
+
+def test_clean_text_matches_reference():
+    resume_analysis = pytest.importorskip('utils.resume_analysis')
+    for text, _ in CORPUS:
+        assert resume_analysis.clean_text(text) == reference_clean_text(text), repr(text)
+
+
+def test_normalize_chunks_matches_reference():
+    for text, chunks in CORPUS:
+        expected_sanitized = reference_sanitize_text(text)
+        sanitized, normalized = normalize_chunks(chunks)
+        assert sanitized == expected_sanitized, repr(chunks)
+        assert normalized == reference_clean_text(expected_sanitized), repr(chunks)
+
+
+def test_normalize_chunks_single_character_chunks():
+    for text in CASES:
+        sanitized, normalized = normalize_chunks(list(text))
+        assert sanitized == reference_sanitize_text(text), repr(text)
+        assert normalized == reference_clean_text(reference_sanitize_text(text)), repr(text)
+
+
+def test_normalize_chunks_extractor_style():
+    # Extractors yield each page or paragraph followed by a newline
+    paragraphs = ['  Senior ΟΔΟΣ Engineer ', '', 'İstanbul • Python, AWS', '😀  ']
+    text = ''.join(p + '\n' for p in paragraphs)
+    sanitized, normalized = normalize_chunks(p + '\n' for p in paragraphs)
+    assert sanitized == reference_sanitize_text(text)
+    assert normalized == reference_clean_text(reference_sanitize_text(text))
@@ -0,0 +1,99 @@
+"""
+Tests for the group-commit writer.
+"""
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models.resume import Base, Resume
+from utils.write_batcher import WriteBatcher
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'batcher.db'}",
+        connect_args={'check_same_thread': False}
+    )
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def insert_resume(name):
+    """Operation adding one resume and returning the session it ran in."""
+    def operation(session):
+        session.add(Resume(filename=name, file_type='pdf', raw_text=name))
+        return session
+    return operation
+
+
+def stored_filenames(session_factory):
+    session = session_factory()
+    try:
+        return sorted(name for name, in session.query(Resume.filename))
+    finally:
+        session.close()
+
+
+def test_concurrent_submits_are_committed_together(session_factory):
+    writers = 8
+    # A long interval leaves max_rows as the only trigger for the flush
+    batcher = WriteBatcher(session_factory, interval_ms=5000, max_rows=writers)
+    barrier = threading.Barrier(writers)
+    futures = [None] * writers
+
+    def submit(i):
+        barrier.wait()
+        futures[i] = batcher.submit(insert_resume(f'resume-{i}.pdf'))
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    sessions = [future.result(timeout=5) for future in futures]
+    batcher.close()
+
+    assert len({id(session) for session in sessions}) == 1
+    assert stored_filenames(session_factory) == sorted(f'resume-{i}.pdf' for i in range(writers))
+
+
+def test_failing_operation_only_fails_its_own_future(session_factory):
+    batcher = WriteBatcher(session_factory, interval_ms=5000, max_rows=3)
+
+    def failing(session):
+        session.add(Resume(filename='bad.pdf', file_type='pdf', raw_text='bad'))
+        raise ValueError('invalid write')
+
+    first = batcher.submit(insert_resume('first.pdf'))
+    bad = batcher.submit(failing)
+    last = batcher.submit(insert_resume('last.pdf'))
+
+    first.result(timeout=5)
+    last.result(timeout=5)
+    with pytest.raises(ValueError, match='invalid write'):
+        bad.result(timeout=5)
+    batcher.close()
+
+    assert stored_filenames(session_factory) == ['first.pdf', 'last.pdf']
+
+
+def test_close_flushes_pending_writes(session_factory):
+    batcher = WriteBatcher(session_factory, interval_ms=5000, max_rows=100)
+    future = batcher.submit(insert_resume('pending.pdf'))
+    batcher.close()
+
+    assert future.done()
+    assert stored_filenames(session_factory) == ['pending.pdf']
+
+
+def test_submit_after_close_raises(session_factory):
+    batcher = WriteBatcher(session_factory)
+    batcher.close()
+    batcher.close()
+
+    with pytest.raises(RuntimeError):
+        batcher.submit(insert_resume('late.pdf'))
@@ -1,10 +1,32 @@
 """
 Database utility functions for the Resume Analyzer application.
 """
-from sqlalchemy import create_engine
+import logging
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, scoped_session
 from sqlalchemy.pool import QueuePool
 from models.resume import Base
+import models.analysis  # noqa: F401 - registers re-analysis tables on Base
+from utils.migrations import add_missing_columns, add_missing_indexes, needs_raw_text_migration
+
+# Pragmas applied to every SQLite connection. WAL lets readers proceed while
+# a write is in progress and busy_timeout waits for the lock instead of
+# failing immediately with "database is locked".
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'temp_store': 'MEMORY',
+    'cache_size': -16000,
+}
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply SQLITE_PRAGMAS to a new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f'PRAGMA {name}={value}')
+    cursor.close()
 
 class Database:
     """Database connection and session management."""
@@ -21,21 +43,33 @@ class Database:
             return
             
         self.database_uri = database_uri
+        is_sqlite = database_uri.startswith('sqlite')
         self.engine = create_engine(
             database_uri,
+            # Pooled SQLite connections are shared across request and writer threads
+            connect_args={'check_same_thread': False} if is_sqlite else {},
             poolclass=QueuePool,
             pool_size=5,
             max_overflow=10,
             pool_timeout=30,
             pool_recycle=1800,
         )
+        if is_sqlite:
+            event.listen(self.engine, 'connect', _set_sqlite_pragmas)
         self.session_factory = sessionmaker(bind=self.engine)
         self.Session = scoped_session(self.session_factory)
         self._initialized = True
     
     def create_tables(self):
-        """Create all tables defined in models."""
+        """Create all tables defined in models and add any missing columns and indexes."""
         Base.metadata.create_all(self.engine)
+        add_missing_columns(self.engine)
+        add_missing_indexes(self.engine)
+        if needs_raw_text_migration(self.engine):
+            raise RuntimeError(
+                'resumes.raw_text must be migrated to compressed binary storage; '
+                'run "python -m utils.migrations" from the backend directory'
+            )
     
     def get_session(self):
         """Get a database session."""
@@ -43,4 +77,27 @@ class Database:
     
     def close_session(self):
         """Close the scoped session."""
-        self.Session.remove()
\ No newline at end of file
+        self.Session.remove()
+
+
+def cli_database(create_tables=True):
+    """
+    Set up logging and the database for a command-line job.
+
+    Args:
+        create_tables: Whether to create missing tables and columns
+
+    Returns:
+        The Database instance for Config.DATABASE_URI
+    """
+    from config import Config
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s [%(levelname)s] - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    db = Database(Config.DATABASE_URI)
+    if create_tables:
+        db.create_tables()
+    return db
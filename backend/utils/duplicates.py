@@ -0,0 +1,185 @@
+"""
+Near-duplicate resume detection backed by stored MinHash signatures.
+
+Backfill missing signatures and print duplicate clusters from the backend
+directory with:
+
+    python -m utils.duplicates --threshold 0.8
+"""
+import argparse
+import json
+import logging
+import threading
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import undefer
+
+from models.resume import Resume
+from utils.minhash import (
+    LSHIndex,
+    cluster_signatures,
+    compute_signature,
+    signature_from_bytes,
+    signature_to_bytes
+)
+
+logger = logging.getLogger(__name__)
+
+
+class DuplicateIndex:
+    """
+    In-process LSH index over the signatures stored in the database.
+
+    The index is filled lazily: each lookup first loads signatures of rows
+    added since the previous sync, so uploads only pay for computing their
+    own signature. Rows synced without a signature are remembered and
+    loaded once a backfill gives them one.
+    """
+
+    # Maximum number of ids bound into one IN (...) query
+    RECHECK_CHUNK_SIZE = 500
+
+    def __init__(self):
+        self.index = LSHIndex()
+        self.last_id = 0
+        self._unsigned = set()
+        self._lock = threading.Lock()
+
+    def sync(self, session):
+        """Load signatures of new resumes and of older ones since backfilled."""
+        with self._lock:
+            rows = session.query(Resume.id, Resume.minhash).filter(
+                Resume.id > self.last_id
+            ).order_by(Resume.id).all()
+            for resume_id, minhash in rows:
+                if minhash is not None:
+                    # Texts without shingles are skipped by insert
+                    self.index.insert(resume_id, signature_from_bytes(minhash))
+                else:
+                    self._unsigned.add(resume_id)
+            if rows:
+                self.last_id = rows[-1][0]
+            if self._unsigned:
+                self._load_backfilled(session)
+
+    def _load_backfilled(self, session):
+        """Load signatures written for remembered unsigned rows, if any were."""
+        unsigned_count = session.query(func.count(Resume.id)).filter(
+            Resume.id <= self.last_id, Resume.minhash.is_(None)
+        ).scalar()
+        # Remembered rows can only have been backfilled or deleted if this dropped
+        if unsigned_count >= len(self._unsigned):
+            return
+        unsigned = sorted(self._unsigned)
+        for start in range(0, len(unsigned), self.RECHECK_CHUNK_SIZE):
+            chunk = unsigned[start:start + self.RECHECK_CHUNK_SIZE]
+            rows = session.query(Resume.id, Resume.minhash).filter(Resume.id.in_(chunk)).all()
+            self._unsigned.difference_update(chunk)
+            for resume_id, minhash in rows:
+                if minhash is None:
+                    self._unsigned.add(resume_id)
+                else:
+                    self.index.insert(resume_id, signature_from_bytes(minhash))
+
+    def remove(self, resume_id):
+        """Drop a deleted resume from the index."""
+        with self._lock:
+            self.index.remove(resume_id)
+            self._unsigned.discard(resume_id)
+
+    def find(self, resume_id, signature, threshold):
+        """
+        Find indexed resumes similar to a signature.
+
+        Args:
+            resume_id: ID of the resume being looked up, excluded from results
+            signature: Its MinHash signature, or None if it has no shingles
+            threshold: Minimum estimated Jaccard similarity
+
+        Returns:
+            List of (resume_id, similarity) pairs, most similar first
+        """
+        with self._lock:
+            matches = self.index.query(signature, threshold)
+        return [(key, similarity) for key, similarity in matches if key != resume_id]
+
+
+def backfill_signatures(session_factory, batch_size=200):
+    """
+    Compute signatures for resumes stored without one.
+
+    Args:
+        session_factory: Callable returning a new session
+        batch_size: Number of resumes updated per transaction
+
+    Returns:
+        Number of signatures computed
+    """
+    total = 0
+    last_id = 0
+    while True:
+        session = session_factory()
+        try:
+            resumes = session.query(Resume).options(undefer(Resume.raw_text)).filter(
+                Resume.id > last_id, Resume.minhash.is_(None)
+            ).order_by(Resume.id).limit(batch_size).all()
+            if not resumes:
+                break
+            for resume in resumes:
+                resume.minhash = signature_to_bytes(compute_signature(resume.raw_text))
+            last_id = resumes[-1].id
+            session.commit()
+            total += len(resumes)
+        finally:
+            session.close()
+        logger.info(f"Computed {total} MinHash signatures (last id {last_id})")
+    return total
+
+
+def cluster_duplicates(session_factory, threshold=0.8):
+    """
+    Cluster all resumes with stored signatures into near-duplicate groups.
+
+    Args:
+        session_factory: Callable returning a new session
+        threshold: Minimum estimated Jaccard similarity between members
+
+    Returns:
+        Lists of resume IDs, one per cluster of two or more resumes;
+        resumes whose text has no shingles are never clustered
+    """
+    session = session_factory()
+    try:
+        rows = session.query(Resume.id, Resume.minhash).filter(
+            Resume.minhash.isnot(None)
+        ).order_by(Resume.id).all()
+    finally:
+        session.close()
+    ids = []
+    signatures = []
+    for resume_id, minhash in rows:
+        signature = signature_from_bytes(minhash)
+        if signature is not None:
+            ids.append(resume_id)
+            signatures.append(signature)
+    if not ids:
+        return []
+    return cluster_signatures(ids, np.stack(signatures), threshold)
+
+
+if __name__ == '__main__':
+    from utils.db import cli_database
+
+    parser = argparse.ArgumentParser(description='Cluster near-duplicate resumes.')
+    parser.add_argument('--threshold', type=float, default=0.8,
+                        help='Minimum estimated Jaccard similarity')
+    parser.add_argument('--batch-size', type=int, default=200,
+                        help='Resumes updated per transaction when backfilling')
+    args = parser.parse_args()
+
+    db = cli_database()
+    backfill_signatures(db.session_factory, batch_size=args.batch_size)
+    clusters = cluster_duplicates(db.session_factory, threshold=args.threshold)
+    logger.info(f"Found {len(clusters)} duplicate clusters")
+    print(json.dumps(clusters))
@@ -2,12 +2,13 @@
 File handling utilities for parsing and extracting text from different file formats.
 """
 import os
-import re
 import PyPDF2
 from werkzeug.utils import secure_filename
-from typing import Tuple, Optional
+from typing import Iterator, Tuple, Optional
 import docx
 
+from utils.text_normalization import normalize_chunks, sanitize
+
 def allowed_file(filename: str, allowed_extensions: set) -> bool:
     """Check if file has an allowed extension."""
     return '.' in filename and \
@@ -44,6 +45,35 @@ def save_file(file, upload_folder: str) -> Tuple[bool, str]:
     except Exception as e:
         return False, str(e)
 
+def iter_text_from_pdf(file_path: str) -> Iterator[str]:
+    """
+    Yield the text of a PDF file one page at a time.
+    
+    Args:
+        file_path: Path to the PDF file
+        
+    Yields:
+        Text of each page followed by a newline
+    """
+    with open(file_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        for page in pdf_reader.pages:
+            yield page.extract_text() + "\n"
+
+def iter_text_from_docx(file_path: str) -> Iterator[str]:
+    """
+    Yield the text of a DOCX file one paragraph at a time.
+    
+    Args:
+        file_path: Path to the DOCX file
+        
+    Yields:
+        Text of each paragraph followed by a newline
+    """
+    doc = docx.Document(file_path)
+    for para in doc.paragraphs:
+        yield para.text + "\n"
+
 def extract_text_from_pdf(file_path: str) -> str:
     """
     Extract text content from PDF file.
@@ -54,15 +84,10 @@ def extract_text_from_pdf(file_path: str) -> str:
     Returns:
         Extracted text as string
     """
-    text = ""
     try:
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
+        return "".join(iter_text_from_pdf(file_path))
     except Exception as e:
-        text = f"Error extracting PDF text: {str(e)}"
-    return text
+        return f"Error extracting PDF text: {str(e)}"
 
 def extract_text_from_docx(file_path: str) -> str:
     """
@@ -74,14 +99,10 @@ def extract_text_from_docx(file_path: str) -> str:
     Returns:
         Extracted text as string
     """
-    text = ""
     try:
-        doc = docx.Document(file_path)
-        for para in doc.paragraphs:
-            text += para.text + "\n"
+        return "".join(iter_text_from_docx(file_path))
     except Exception as e:
-        text = f"Error extracting DOCX text: {str(e)}"
-    return text
+        return f"Error extracting DOCX text: {str(e)}"
 
 def get_file_extension(filename: str) -> str:
     """Get the file extension from filename."""
@@ -105,18 +126,45 @@ def extract_text(file_path: str, file_type: str) -> str:
     else:
         return "Unsupported file type"
 
+def extract_normalized_text(file_path: str, file_type: str) -> Tuple[bool, str, str]:
+    """
+    Extract and normalize text in a single streaming pass.
+    
+    Pages or paragraphs are normalized as the extractor produces them, so
+    the raw text of the whole document is never held in memory.
+    
+    Args:
+        file_path: Path to the file
+        file_type: Type of the file (pdf, docx)
+        
+    Returns:
+        Tuple containing success status, sanitized text (or error message)
+        and analysis-ready normalized text
+    """
+    if file_type == 'pdf':
+        chunks, label = iter_text_from_pdf(file_path), 'PDF'
+    elif file_type == 'docx':
+        chunks, label = iter_text_from_docx(file_path), 'DOCX'
+    else:
+        return False, "Unsupported file type", ""
+    
+    try:
+        sanitized_text, normalized_text = normalize_chunks(chunks)
+    except Exception as e:
+        return False, f"Error extracting {label} text: {str(e)}", ""
+    return True, sanitized_text, normalized_text
+
 def sanitize_text(text: str) -> str:
     """
     Sanitize extracted text.
     
+    Collapses whitespace, removes special characters that might cause
+    issues and strips the result.
+    
     Args:
         text: Text to sanitize
         
     Returns:
         Sanitized text
     """
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
-    # Remove special characters that might cause issues
-    text = re.sub(r'[^\w\s.\-,;:()\[\]{}\'\"?!@#$%^&*+=]', '', text)
-    return text.strip()
\ No newline at end of file
+    return sanitize(text)
\ No newline at end of file
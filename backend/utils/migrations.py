@@ -0,0 +1,225 @@
+"""
+Schema and data migrations for the Resume Analyzer database.
+
+Run pending data migrations from the backend directory with:
+
+    python -m utils.migrations --batch-size 500
+"""
+import argparse
+import logging
+
+from sqlalchemy import String, Text, case, func, inspect, text
+from sqlalchemy.sql import column, table
+
+from models.resume import Base, Resume, PREVIEW_LENGTH, make_text_preview
+
+# Name the uncompressed column is moved to while non-SQLite databases migrate
+LEGACY_RAW_TEXT_COLUMN = 'raw_text_legacy'
+
+logger = logging.getLogger(__name__)
+
+
+def add_missing_columns(engine):
+    """
+    Add columns defined on the models but missing from existing tables.
+
+    ``create_all`` only creates missing tables, so databases created by an
+    older release need new nullable columns added explicitly.
+
+    Args:
+        engine: SQLAlchemy engine bound to the database
+
+    Returns:
+        List of "table.column" names that were added
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    added = []
+    with engine.begin() as conn:
+        for model_table in Base.metadata.sorted_tables:
+            if model_table.name not in existing_tables:
+                continue
+            existing = {col['name'] for col in inspector.get_columns(model_table.name)}
+            for model_column in model_table.columns:
+                if model_column.name in existing:
+                    continue
+                column_type = model_column.type.compile(dialect=engine.dialect)
+                conn.execute(text(
+                    f'ALTER TABLE {model_table.name} ADD COLUMN {model_column.name} {column_type}'
+                ))
+                added.append(f'{model_table.name}.{model_column.name}')
+    for name in added:
+        logger.info(f"Added missing column {name}")
+    if 'resumes.text_preview' in added:
+        _fill_text_preview(engine)
+    return added
+
+
+def add_missing_indexes(engine):
+    """
+    Create indexes defined on the models but missing from existing tables.
+
+    Like columns, indexes of tables that already exist are skipped by
+    ``create_all``.
+
+    Args:
+        engine: SQLAlchemy engine bound to the database
+
+    Returns:
+        List of index names that were created
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    added = []
+    with engine.begin() as conn:
+        for model_table in Base.metadata.sorted_tables:
+            if model_table.name not in existing_tables:
+                continue
+            existing = {index['name'] for index in inspector.get_indexes(model_table.name)}
+            for index in model_table.indexes:
+                if index.name not in existing:
+                    index.create(conn)
+                    added.append(index.name)
+    for name in added:
+        logger.info(f"Created missing index {name}")
+    return added
+
+
+def _fill_text_preview(engine):
+    """Fill text_preview from the still uncompressed raw_text of legacy rows."""
+    resumes = table('resumes', column('raw_text', Text), column('text_preview', String))
+    # MySQL's length() counts bytes, not characters
+    length = func.char_length if engine.dialect.name == 'mysql' else func.length
+    preview = case(
+        (
+            length(resumes.c.raw_text) > PREVIEW_LENGTH,
+            func.substr(resumes.c.raw_text, 1, PREVIEW_LENGTH, type_=Text) + '...'
+        ),
+        else_=resumes.c.raw_text
+    )
+    with engine.begin() as conn:
+        conn.execute(resumes.update().values(text_preview=preview))
+    logger.info("Filled text_preview for existing resumes")
+
+
+def _raw_text_columns(engine):
+    """Map the names of the resumes text columns present to their reflected types."""
+    return {
+        col['name']: col['type']
+        for col in inspect(engine).get_columns('resumes')
+        if col['name'] in ('raw_text', LEGACY_RAW_TEXT_COLUMN)
+    }
+
+
+def needs_raw_text_migration(engine):
+    """
+    Check whether raw_text must be migrated before the app can write to it.
+
+    SQLite stores compressed bytes in a TEXT column as-is, so only other
+    databases need their column type changed.
+
+    Args:
+        engine: SQLAlchemy engine bound to the database
+
+    Returns:
+        True if resumes.raw_text is still a text column (or mid-migration)
+    """
+    if engine.dialect.name == 'sqlite' or not inspect(engine).has_table('resumes'):
+        return False
+    columns = _raw_text_columns(engine)
+    return LEGACY_RAW_TEXT_COLUMN in columns or isinstance(columns.get('raw_text'), String)
+
+
+def _move_text_column(engine):
+    """Move the TEXT raw_text column aside and add the binary column in its place."""
+    binary_type = Resume.__table__.c.raw_text.type.compile(dialect=engine.dialect)
+    with engine.begin() as conn:
+        conn.execute(text(f'ALTER TABLE resumes RENAME COLUMN raw_text TO {LEGACY_RAW_TEXT_COLUMN}'))
+        conn.execute(text(f'ALTER TABLE resumes ADD COLUMN raw_text {binary_type}'))
+    logger.info(f"Moved uncompressed raw_text to {LEGACY_RAW_TEXT_COLUMN}")
+
+
+def compress_raw_text(engine, batch_size=500):
+    """
+    Compress resume texts stored uncompressed by older releases.
+
+    Rows are processed in primary key order, one transaction per batch, so
+    the migration can be interrupted and re-run safely. The uncompressed
+    preview is filled in for the same rows.
+
+    SQLite rows are rewritten in place. Other databases cannot store bytes
+    in a TEXT column, so the old column is renamed, a binary raw_text column
+    is added, rows are copied across compressed and the old column is
+    dropped. Stop the app while this runs; it refuses to start until done.
+
+    Args:
+        engine: SQLAlchemy engine bound to the database
+        batch_size: Number of rows read and rewritten per transaction
+
+    Returns:
+        Number of rows compressed
+    """
+    if not inspect(engine).has_table('resumes'):
+        return 0
+    source = 'raw_text'
+    if engine.dialect.name != 'sqlite':
+        columns = _raw_text_columns(engine)
+        if LEGACY_RAW_TEXT_COLUMN not in columns and isinstance(columns.get('raw_text'), String):
+            _move_text_column(engine)
+            columns = _raw_text_columns(engine)
+        if LEGACY_RAW_TEXT_COLUMN in columns:
+            source = LEGACY_RAW_TEXT_COLUMN
+
+    compressed_type = Resume.__table__.c.raw_text.type
+    bind_processor = compressed_type.bind_processor(engine.dialect)
+    # Rows already copied by an interrupted run are skipped
+    pending = ' AND raw_text IS NULL' if source == LEGACY_RAW_TEXT_COLUMN else ''
+    select_batch = text(
+        f'SELECT id, {source} FROM resumes WHERE id > :last_id{pending} ORDER BY id LIMIT :limit'
+    )
+    update_row = text(
+        'UPDATE resumes SET raw_text = :raw_text, text_preview = :text_preview WHERE id = :id'
+    )
+
+    last_id = 0
+    total = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(select_batch, {'last_id': last_id, 'limit': batch_size}).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            # Only legacy rows come back as str; compressed rows are bytes
+            updates = [
+                {
+                    'id': row_id,
+                    'raw_text': bind_processor(raw_text),
+                    'text_preview': make_text_preview(raw_text)
+                }
+                for row_id, raw_text in rows
+                if isinstance(raw_text, str)
+            ]
+            if updates:
+                conn.execute(update_row, updates)
+        total += len(updates)
+        logger.info(f"Compressed {total} resume texts (last id {last_id})")
+
+    if source == LEGACY_RAW_TEXT_COLUMN:
+        with engine.begin() as conn:
+            conn.execute(text(f'ALTER TABLE resumes DROP COLUMN {LEGACY_RAW_TEXT_COLUMN}'))
+        logger.info(f"Dropped {LEGACY_RAW_TEXT_COLUMN}")
+    return total
+
+
+if __name__ == '__main__':
+    from utils.db import cli_database
+
+    parser = argparse.ArgumentParser(description='Run pending data migrations.')
+    parser.add_argument('--batch-size', type=int, default=500,
+                        help='Rows rewritten per transaction')
+    args = parser.parse_args()
+
+    db = cli_database(create_tables=False)
+    add_missing_columns(db.engine)
+    compress_raw_text(db.engine, batch_size=args.batch_size)
+    db.create_tables()
@@ -0,0 +1,285 @@
+"""
+MinHash signatures and LSH banding for near-duplicate resume detection.
+"""
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+NUM_PERM = 128
+LSH_BANDS = 32
+SHINGLE_SIZE = 3
+# Probability with which banding must surface a pair at the query threshold
+LSH_RECALL = 0.95
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+# Stored for texts with no shingles, such as scanned PDFs without a text
+# layer; they have nothing to compare and are never reported as duplicates
+EMPTY_SIGNATURE = b''
+
+# Fixed seed so signatures stored in the database stay comparable
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, np.iinfo(np.int64).max, size=NUM_PERM, dtype=np.int64).astype(np.uint64)
+_PERM_B = _rng.randint(0, np.iinfo(np.int64).max, size=NUM_PERM, dtype=np.int64).astype(np.uint64)
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    """
+    Split text into overlapping word shingles.
+
+    Args:
+        text: Sanitized resume text
+        size: Number of words per shingle
+
+    Returns:
+        Set of shingles
+    """
+    words = text.lower().split()
+    if len(words) < size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def compute_signature(text: str) -> Optional[np.ndarray]:
+    """
+    Compute the MinHash signature of a text.
+
+    Args:
+        text: Sanitized resume text
+
+    Returns:
+        Array of NUM_PERM uint32 minimum hash values, or None if the text
+        has no shingles
+    """
+    items = shingles(text)
+    if not items:
+        return None
+    hashes = np.fromiter(
+        (zlib.crc32(item.encode('utf-8')) for item in items),
+        dtype=np.uint64,
+        count=len(items)
+    )
+    # One universal hash per permutation, evaluated for all shingles at once
+    with np.errstate(over='ignore'):
+        permuted = (np.outer(hashes, _PERM_A) + _PERM_B) % _MERSENNE_PRIME
+    return (permuted & _MAX_HASH).min(axis=0).astype(np.uint32)
+
+
+def signature_to_bytes(signature: Optional[np.ndarray]) -> bytes:
+    """Serialize a signature for storage; None becomes EMPTY_SIGNATURE."""
+    if signature is None:
+        return EMPTY_SIGNATURE
+    return signature.astype('<u4').tobytes()
+
+
+def signature_from_bytes(data: bytes) -> Optional[np.ndarray]:
+    """
+    Deserialize a stored signature.
+
+    Returns None for texts without shingles, including rows stored by
+    earlier releases as a signature of all maximum hash values.
+    """
+    if not data:
+        return None
+    signature = np.frombuffer(data, dtype='<u4')
+    if (signature == _MAX_HASH).all():
+        return None
+    return signature
+
+
+def estimate_similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """Estimate the Jaccard similarity of two texts from their signatures."""
+    return float(np.mean(sig_a == sig_b))
+
+
+def banding_threshold(bands: int, rows: int, recall: float = LSH_RECALL) -> float:
+    """
+    Lowest similarity at which banding finds a pair with the given recall.
+
+    A pair with Jaccard similarity s shares at least one band with
+    probability 1 - (1 - s**rows)**bands; this solves that for s.
+
+    Args:
+        bands: Number of bands
+        rows: Rows per band
+        recall: Required probability of becoming a candidate
+
+    Returns:
+        Similarity threshold
+    """
+    return (1 - (1 - recall) ** (1 / bands)) ** (1 / rows)
+
+
+class LSHIndex:
+    """
+    Locality-sensitive hashing index over MinHash signatures.
+
+    Signatures are split into bands; keys whose signatures agree on every
+    row of at least one band become candidates. With the default 32 bands
+    of 4 rows, pairs at or above about 0.55 Jaccard similarity become
+    candidates at least 95% of the time. Queries with a lower threshold
+    would silently miss matches, so they compare against every signature.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, bands: int = LSH_BANDS):
+        if num_perm % bands:
+            raise ValueError('num_perm must be divisible by bands')
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.min_threshold = banding_threshold(bands, self.rows)
+        self.signatures: Dict[int, np.ndarray] = {}
+        self._buckets = [defaultdict(set) for _ in range(bands)]
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def __contains__(self, key):
+        return key in self.signatures
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            signature[i * self.rows:(i + 1) * self.rows].tobytes()
+            for i in range(self.bands)
+        ]
+
+    def insert(self, key: int, signature: Optional[np.ndarray]):
+        """Add or replace the signature stored for a key; None only removes it."""
+        if key in self.signatures:
+            self.remove(key)
+        if signature is None:
+            return
+        self.signatures[key] = signature
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            bucket[band_key].add(key)
+
+    def remove(self, key: int):
+        """Remove a key from the index if present."""
+        signature = self.signatures.pop(key, None)
+        if signature is None:
+            return
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            keys = bucket.get(band_key)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del bucket[band_key]
+
+    def candidates(self, signature: np.ndarray) -> Set[int]:
+        """Return keys sharing at least one band with the signature."""
+        found = set()
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            found.update(bucket.get(band_key, ()))
+        return found
+
+    def query(self, signature: Optional[np.ndarray], threshold: float) -> List[Tuple[int, float]]:
+        """
+        Find indexed keys similar to a signature.
+
+        Below ``min_threshold`` every indexed signature is compared instead
+        of only the banding candidates.
+
+        Args:
+            signature: MinHash signature to look up, or None for a text
+                without shingles, which matches nothing
+            threshold: Minimum estimated Jaccard similarity
+
+        Returns:
+            List of (key, similarity) pairs, most similar first
+        """
+        if signature is None:
+            return []
+        if threshold < self.min_threshold:
+            keys = list(self.signatures)
+        else:
+            keys = list(self.candidates(signature))
+        if not keys:
+            return []
+        matrix = np.stack([self.signatures[key] for key in keys])
+        similarities = (matrix == signature).mean(axis=1)
+        results = [
+            (key, float(similarity))
+            for key, similarity in zip(keys, similarities)
+            if similarity >= threshold
+        ]
+        return sorted(results, key=lambda item: (-item[1], item[0]))
+
+
+def _void_rows(matrix: np.ndarray) -> np.ndarray:
+    """View each row of a matrix as a single opaque value so rows can be grouped."""
+    matrix = np.ascontiguousarray(matrix)
+    return matrix.view(np.dtype((np.void, matrix.dtype.itemsize * matrix.shape[1]))).ravel()
+
+
+def _groups(labels: np.ndarray) -> List[np.ndarray]:
+    """Split row indices into groups sharing the same label."""
+    order = np.argsort(labels, kind='stable')
+    boundaries = np.flatnonzero(np.diff(labels[order])) + 1
+    return np.split(order, boundaries)
+
+
+def cluster_signatures(keys: Iterable[int], signatures: np.ndarray,
+                       threshold: float, bands: int = LSH_BANDS) -> List[List[int]]:
+    """
+    Group keys into clusters of near-duplicates.
+
+    Identical signatures are merged first. Band keys for the remaining
+    signatures are computed for the whole matrix at once, candidates sharing
+    a band are verified with a vectorized similarity estimate, and connected
+    pairs are merged with union-find. Thresholds below the banding's
+    reliable range compare every pair instead.
+
+    Args:
+        keys: Keys in the same order as the signature rows
+        signatures: Matrix of shape (n, NUM_PERM)
+        threshold: Minimum estimated Jaccard similarity for a pair
+        bands: Number of LSH bands
+
+    Returns:
+        Clusters of two or more keys, each sorted, largest cluster first
+    """
+    keys = list(keys)
+    if not keys:
+        return []
+    signatures = np.asarray(signatures, dtype=np.uint32)
+    _, first_rows, inverse = np.unique(
+        _void_rows(signatures), return_index=True, return_inverse=True
+    )
+    unique = signatures[first_rows]
+    rows = unique.shape[1] // bands
+    parent = list(range(len(unique)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    if threshold < banding_threshold(bands, rows):
+        for i in range(len(unique) - 1):
+            similarities = (unique[i + 1:] == unique[i]).mean(axis=1)
+            for j in np.flatnonzero(similarities >= threshold):
+                parent[find(i + 1 + int(j))] = find(i)
+        bands = 0
+
+    for band in range(bands):
+        _, labels = np.unique(
+            _void_rows(unique[:, band * rows:(band + 1) * rows]), return_inverse=True
+        )
+        for group in _groups(labels.ravel()):
+            if len(group) < 2:
+                continue
+            members = unique[group]
+            similarities = (members[:, None, :] == members[None, :, :]).mean(axis=2)
+            for a, b in zip(*np.nonzero(np.triu(similarities >= threshold, k=1))):
+                parent[find(group[a])] = find(group[b])
+
+    clusters = defaultdict(list)
+    for row, unique_row in enumerate(inverse.ravel()):
+        clusters[find(unique_row)].append(keys[row])
+    return sorted(
+        (sorted(members) for members in clusters.values() if len(members) > 1),
+        key=lambda members: (-len(members), members[0])
+    )
@@ -0,0 +1,279 @@
+"""
+Incremental re-analysis of stored resumes after the skill taxonomy changes.
+
+The current SKILLS list is diffed against the last recorded snapshot. Only
+resumes whose term index contains every word of an added or removed skill
+are re-matched, and only against the added skills. Progress is stored after
+every batch, so an interrupted run continues where it stopped. Resumes
+uploaded since the last run have no stored analysis yet and are then
+analyzed in full.
+
+Run from the backend directory with:
+
+    python -m utils.reanalysis --batch-size 200
+"""
+import argparse
+import logging
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy.orm import undefer
+
+from models.analysis import ReanalysisJob, TaxonomySnapshot
+from models.resume import Resume
+from utils.resume_analysis import (
+    SKILLS,
+    analyze_resume,
+    build_skill_matcher,
+    clean_text,
+    extract_skills
+)
+from utils.term_index import candidate_ids_query, index_missing_terms
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_taxonomy(skills: List[str]) -> List[str]:
+    """Lowercase and deduplicate skill phrases, as stored in snapshots."""
+    return sorted({skill.lower() for skill in skills})
+
+
+def diff_taxonomy(old: List[str], new: List[str]) -> Tuple[List[str], List[str]]:
+    """
+    Compare two skill taxonomies.
+
+    Args:
+        old: Skills the stored analyses were computed against
+        new: Current skills
+
+    Returns:
+        Tuple of (added skills, removed skills); a changed skill appears in both
+    """
+    old_set = set(normalize_taxonomy(old))
+    new_set = set(normalize_taxonomy(new))
+    return sorted(new_set - old_set), sorted(old_set - new_set)
+
+
+def _analysis_text(resume) -> str:
+    """Analysis-ready text of a resume, cleaning raw_text only for older rows."""
+    if resume.normalized_text is not None:
+        return resume.normalized_text
+    return clean_text(resume.raw_text)
+
+
+def _candidate_filter(query, skills):
+    """Restrict a Resume query to stored analyses that the skills may affect."""
+    query = query.filter(Resume.analysis.isnot(None))
+    candidates = candidate_ids_query(skills)
+    if candidates is not None:
+        query = query.filter(Resume.id.in_(candidates))
+    return query
+
+
+def start_job(session_factory, skills: List[str] = SKILLS) -> Optional[int]:
+    """
+    Find or create the re-analysis job for the current taxonomy.
+
+    An unfinished job is always resumed first. Otherwise the taxonomy is
+    diffed against the latest snapshot and a job is created if it changed.
+    The first run only records a baseline snapshot.
+
+    Args:
+        session_factory: Callable returning a new session
+        skills: Current skill taxonomy
+
+    Returns:
+        ID of the job to run, or None if nothing needs re-analysis
+    """
+    session = session_factory()
+    try:
+        job = session.query(ReanalysisJob).filter(
+            ReanalysisJob.status == 'running'
+        ).order_by(ReanalysisJob.id).first()
+        if job is not None:
+            logger.info(f"Resuming re-analysis job {job.id} at resume {job.last_resume_id}")
+            return job.id
+
+        snapshot = session.query(TaxonomySnapshot).order_by(TaxonomySnapshot.id.desc()).first()
+        if snapshot is None:
+            session.add(TaxonomySnapshot(skills=normalize_taxonomy(skills)))
+            session.commit()
+            logger.info("Recorded baseline skill taxonomy")
+            return None
+
+        added, removed = diff_taxonomy(snapshot.skills, skills)
+        if not added and not removed:
+            logger.info("Skill taxonomy unchanged; nothing to re-analyze")
+            return None
+
+        new_snapshot = TaxonomySnapshot(skills=normalize_taxonomy(skills))
+        session.add(new_snapshot)
+        session.flush()
+        total = _candidate_filter(session.query(Resume.id), added + removed).count()
+        job = ReanalysisJob(
+            from_snapshot_id=snapshot.id,
+            to_snapshot_id=new_snapshot.id,
+            added_skills=added,
+            removed_skills=removed,
+            last_resume_id=0,
+            processed=0,
+            total=total,
+            status='running'
+        )
+        session.add(job)
+        session.commit()
+        logger.info(
+            f"Created re-analysis job {job.id}: {len(added)} added, "
+            f"{len(removed)} removed skills, {total} candidate resumes"
+        )
+        return job.id
+    finally:
+        session.close()
+
+
+def run_job(session_factory, job_id: int, batch_size: int = 200,
+            progress: Optional[Callable[[dict], None]] = None) -> dict:
+    """
+    Re-match candidate resumes of a job in batches.
+
+    Each batch updates the stored analyses and the job position in one
+    transaction.
+
+    Args:
+        session_factory: Callable returning a new session
+        job_id: ID of the job to run
+        batch_size: Number of resumes updated per transaction
+        progress: Optional callback receiving the job state after each
+            batch, with ``phase`` set to ``'job'``
+
+    Returns:
+        Final job state as a dictionary
+    """
+    session = session_factory()
+    try:
+        job = session.query(ReanalysisJob).get(job_id)
+        added = list(job.added_skills)
+        removed = set(job.removed_skills)
+        affected = added + sorted(removed)
+    finally:
+        session.close()
+    matcher = build_skill_matcher(added) if added else None
+
+    while True:
+        session = session_factory()
+        try:
+            job = session.query(ReanalysisJob).get(job_id)
+            resumes = _candidate_filter(
+                session.query(Resume).options(
+                    undefer(Resume.raw_text), undefer(Resume.normalized_text), undefer(Resume.analysis)
+                ),
+                affected
+            ).filter(
+                Resume.id > job.last_resume_id
+            ).order_by(Resume.id).limit(batch_size).all()
+
+            if not resumes:
+                job.status = 'completed'
+                session.commit()
+                logger.info(f"Re-analysis job {job_id} completed: {job.processed} resumes updated")
+                return job.to_dict()
+
+            for resume in resumes:
+                found = extract_skills(_analysis_text(resume), matcher) if matcher else []
+                analysis = dict(resume.analysis)
+                analysis['skills'] = sorted((set(analysis.get('skills', [])) - removed) | set(found))
+                resume.analysis = analysis
+
+            job.last_resume_id = resumes[-1].id
+            job.processed += len(resumes)
+            session.commit()
+            state = job.to_dict()
+        finally:
+            session.close()
+
+        logger.info(f"Re-analysis job {job_id}: {state['processed']}/{state['total']} resumes")
+        if progress is not None:
+            progress(dict(state, phase='job'))
+
+
+def analyze_missing(session_factory, skills: List[str] = SKILLS, batch_size: int = 50,
+                    progress: Optional[Callable[[dict], None]] = None) -> int:
+    """
+    Run the full analysis for resumes that have no stored analysis.
+
+    Args:
+        session_factory: Callable returning a new session
+        skills: Skill taxonomy to match
+        batch_size: Number of resumes analyzed per transaction
+        progress: Optional callback receiving ``phase`` (``'analyze'``),
+            the count analyzed and the last resume ID after each batch
+
+    Returns:
+        Number of resumes analyzed
+    """
+    matcher = build_skill_matcher(skills)
+    total = 0
+    last_id = 0
+    while True:
+        session = session_factory()
+        try:
+            resumes = session.query(Resume).options(
+                undefer(Resume.raw_text), undefer(Resume.normalized_text)
+            ).filter(
+                Resume.id > last_id, Resume.analysis.is_(None)
+            ).order_by(Resume.id).limit(batch_size).all()
+            if not resumes:
+                break
+            for resume in resumes:
+                resume.analysis = analyze_resume(_analysis_text(resume), normalized=True, matcher=matcher)
+            last_id = resumes[-1].id
+            session.commit()
+            total += len(resumes)
+        finally:
+            session.close()
+        logger.info(f"Analyzed {total} resumes (last id {last_id})")
+        if progress is not None:
+            progress({'phase': 'analyze', 'analyzed': total, 'last_resume_id': last_id})
+    return total
+
+
+def reanalyze(session_factory, skills: List[str] = SKILLS, batch_size: int = 200,
+              progress: Optional[Callable[[dict], None]] = None) -> dict:
+    """
+    Bring stored analyses up to date with the current skill taxonomy.
+
+    Incremental jobs run first, then resumes without a stored analysis
+    (such as new uploads) are analyzed in full against the current skills.
+
+    Args:
+        session_factory: Callable returning a new session
+        skills: Current skill taxonomy
+        batch_size: Number of resumes updated per transaction
+        progress: Optional callback receiving a dictionary after each batch;
+            its ``phase`` key tells job batches (``'job'``, the job state)
+            from full-analysis batches (``'analyze'``, see analyze_missing)
+
+    Returns:
+        Dictionary with the final job state (None if no job was needed)
+        and the number of resumes analyzed in full
+    """
+    index_missing_terms(session_factory, batch_size=batch_size)
+    state = None
+    # A resumed job may predate the latest change, so repeat until up to date
+    job_id = start_job(session_factory, skills)
+    while job_id is not None:
+        state = run_job(session_factory, job_id, batch_size=batch_size, progress=progress)
+        job_id = start_job(session_factory, skills)
+    analyzed = analyze_missing(session_factory, skills, batch_size=batch_size, progress=progress)
+    return {'job': state, 'analyzed': analyzed}
+
+
+if __name__ == '__main__':
+    from utils.db import cli_database
+
+    parser = argparse.ArgumentParser(description='Re-analyze resumes after a skill taxonomy change.')
+    parser.add_argument('--batch-size', type=int, default=200,
+                        help='Resumes updated per transaction')
+    args = parser.parse_args()
+
+    db = cli_database()
+    reanalyze(db.session_factory, batch_size=args.batch_size)
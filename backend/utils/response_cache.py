@@ -0,0 +1,83 @@
+"""
+Server-side cache of serialized JSON responses for read endpoints.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+CachedResponse = namedtuple('CachedResponse', ['body', 'etag', 'validator', 'expires'])
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of serialized responses.
+
+    Write paths invalidate the keys they affect. Every invalidation bumps a
+    generation counter; a reader passes the generation it saw before
+    querying the database to ``set``, so a response built from data that
+    was changed mid-request is never stored.
+
+    Invalidation only reaches this process, so each entry also records a
+    validator: a cheap value read from the database before the response
+    was built. ``get`` only returns the entry while the current validator
+    still matches, which catches changes made by other workers and jobs.
+    """
+
+    def __init__(self, max_entries=256, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.generation = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, validator):
+        """
+        Return the cached response for a key.
+
+        Args:
+            key: Cache key
+            validator: Current value of the validator for the key
+
+        Returns:
+            The CachedResponse, or None if missing, expired or stale
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.validator != validator or entry.expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, body, generation, validator):
+        """
+        Store a serialized response.
+
+        Args:
+            key: Cache key
+            body: Serialized response body
+            generation: Value of ``generation`` read before loading the data
+            validator: Validator read before loading the data
+
+        Returns:
+            The CachedResponse, whether or not it was stored
+        """
+        etag = hashlib.sha1(body.encode('utf-8')).hexdigest()
+        entry = CachedResponse(body, etag, validator, time.monotonic() + self.ttl)
+        with self._lock:
+            if generation == self.generation:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, *keys):
+        """Drop cached responses for the given keys."""
+        with self._lock:
+            self.generation += 1
+            for key in keys:
+                self._entries.pop(key, None)
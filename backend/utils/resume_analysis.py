@@ -9,6 +9,8 @@ import nltk
 from nltk.corpus import stopwords
 from collections import Counter
 
+from utils.text_normalization import normalize
+
 # Ensure NLTK stopwords are downloaded
 try:
     nltk.data.find('corpora/stopwords')
@@ -34,9 +36,16 @@ ACTION_VERBS = [
     'deployed', 'optimized', 'improved', 'collaborated', 'coordinated', 'executed', 'delivered'
 ]
 
+
+def build_skill_matcher(skills: List[str]) -> PhraseMatcher:
+    """Build a PhraseMatcher for the given skill phrases."""
+    matcher = PhraseMatcher(nlp.vocab, attr='LOWER')
+    matcher.add('SKILL', [nlp.make_doc(skill) for skill in skills])
+    return matcher
+
+
 # Precompile matchers for efficiency
-skill_matcher = PhraseMatcher(nlp.vocab, attr='LOWER')
-skill_matcher.add('SKILL', [nlp.make_doc(skill) for skill in SKILLS])
+skill_matcher = build_skill_matcher(SKILLS)
 action_matcher = PhraseMatcher(nlp.vocab, attr='LOWER')
 action_matcher.add('ACTION', [nlp.make_doc(verb) for verb in ACTION_VERBS])
 
@@ -46,20 +55,17 @@ STOPWORDS = set(stopwords.words('english'))
 def clean_text(text: str) -> str:
     """Clean and normalize text."""
     try:
-        text = text.lower()
-        text = re.sub(r'[^\w\s\-.,;:()\[\]{}\'\"?!@#$%^&*+=]', '', text)
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
+        return normalize(text)
     except Exception as e:
         logger.error(f"Error cleaning text: {e}")
         return text
 
 
-def extract_skills(text: str) -> List[str]:
-    """Extract skills from text using spaCy PhraseMatcher."""
+def extract_skills(text: str, matcher: PhraseMatcher = None) -> List[str]:
+    """Extract skills from text using spaCy PhraseMatcher (all SKILLS by default)."""
     try:
         doc = nlp(text)
-        matches = skill_matcher(doc)
+        matches = (matcher or skill_matcher)(doc)
         found = set()
         for match_id, start, end in matches:
             found.add(doc[start:end].text.lower())
@@ -109,11 +115,18 @@ def analyze_job_description(jd_text: str) -> Dict[str, Any]:
         return {'skills': [], 'keywords': []}
 
 
-def analyze_resume(resume_text: str) -> Dict[str, Any]:
-    """Extract skills, action verbs, and keywords from resume."""
+def analyze_resume(resume_text: str, normalized: bool = False,
+                   matcher: PhraseMatcher = None) -> Dict[str, Any]:
+    """
+    Extract skills, action verbs, and keywords from resume.
+
+    Pass ``normalized=True`` with a stored resume's ``normalized_text`` to
+    skip cleaning it again, and a matcher from ``build_skill_matcher`` to
+    match skills other than SKILLS.
+    """
     try:
-        cleaned = clean_text(resume_text)
-        skills = extract_skills(cleaned)
+        cleaned = resume_text if normalized else clean_text(resume_text)
+        skills = extract_skills(cleaned, matcher)
         actions = extract_action_verbs(cleaned)
         keywords = extract_keywords(cleaned)
         return {
@@ -126,10 +139,10 @@ def analyze_resume(resume_text: str) -> Dict[str, Any]:
         return {'skills': [], 'action_verbs': [], 'keywords': []}
 
 
-def match_resume_to_job(resume_text: str, jd_text: str) -> Dict[str, Any]:
+def match_resume_to_job(resume_text: str, jd_text: str, normalized: bool = False) -> Dict[str, Any]:
     """Match resume to job description and return structured analysis."""
     try:
-        resume_data = analyze_resume(resume_text)
+        resume_data = analyze_resume(resume_text, normalized=normalized)
         job_data = analyze_job_description(jd_text)
         resume_skills = set(resume_data['skills'])
         job_skills = set(job_data['skills'])
@@ -0,0 +1,122 @@
+"""
+Inverted word index over resume texts.
+
+The index is a cheap pre-filter: a resume can only match a skill phrase if
+it contains every word token of that phrase, so re-analysis after a
+taxonomy change only needs to look at resumes returned here.
+"""
+import re
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy import distinct, false, func, select, union
+from sqlalchemy.orm import undefer
+
+from models.resume import Resume, ResumeTerm
+
+MAX_TERM_LENGTH = 64
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def extract_terms(text: str) -> Set[str]:
+    """
+    Extract the distinct lowercase word tokens of a text.
+
+    Args:
+        text: Resume text
+
+    Returns:
+        Set of terms short enough to be indexed
+    """
+    return {
+        term for term in _WORD_RE.findall(text.lower())
+        if len(term) <= MAX_TERM_LENGTH
+    }
+
+
+def skill_terms(skill: str) -> List[str]:
+    """Word tokens a resume must contain to possibly match a skill."""
+    return sorted(set(_WORD_RE.findall(skill.lower())))
+
+
+def index_resume_terms(session, resume_id: int, text: str):
+    """
+    Store the terms of a resume, replacing any previous entries.
+
+    Args:
+        session: Active session; the caller commits
+        resume_id: ID of the resume
+        text: Resume text
+    """
+    session.query(ResumeTerm).filter(ResumeTerm.resume_id == resume_id).delete(
+        synchronize_session=False
+    )
+    rows = [{'term': term, 'resume_id': resume_id} for term in extract_terms(text)]
+    if rows:
+        session.execute(ResumeTerm.__table__.insert(), rows)
+
+
+def delete_resume_terms(session, resume_id: int):
+    """Remove the terms of a deleted resume."""
+    session.query(ResumeTerm).filter(ResumeTerm.resume_id == resume_id).delete(
+        synchronize_session=False
+    )
+
+
+def candidate_ids_query(skills: Iterable[str]) -> Optional[object]:
+    """
+    Build a query selecting resumes that could contain any of the skills.
+
+    Args:
+        skills: Skill phrases
+
+    Returns:
+        Selectable of resume ids, or None if some skill has no word tokens
+        and therefore every resume is a candidate
+    """
+    selects = []
+    for skill in skills:
+        terms = skill_terms(skill)
+        if not terms:
+            return None
+        selects.append(
+            select(ResumeTerm.resume_id)
+            .where(ResumeTerm.term.in_(terms))
+            .group_by(ResumeTerm.resume_id)
+            .having(func.count(distinct(ResumeTerm.term)) == len(terms))
+        )
+    if not selects:
+        return select(ResumeTerm.resume_id).where(false())
+    return union(*selects) if len(selects) > 1 else selects[0]
+
+
+def index_missing_terms(session_factory, batch_size=200):
+    """
+    Index resumes stored before the term index existed.
+
+    Args:
+        session_factory: Callable returning a new session
+        batch_size: Number of resumes indexed per transaction
+
+    Returns:
+        Number of resumes indexed
+    """
+    indexed = select(ResumeTerm.resume_id)
+    total = 0
+    last_id = 0
+    while True:
+        session = session_factory()
+        try:
+            resumes = session.query(Resume).options(undefer(Resume.raw_text)).filter(
+                Resume.id > last_id, Resume.id.notin_(indexed)
+            ).order_by(Resume.id).limit(batch_size).all()
+            if not resumes:
+                break
+            for resume in resumes:
+                index_resume_terms(session, resume.id, resume.raw_text)
+            last_id = resumes[-1].id
+            session.commit()
+            total += len(resumes)
+        finally:
+            session.close()
+    return total
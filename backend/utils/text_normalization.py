@@ -0,0 +1,185 @@
+"""
+Incremental text normalization shared by ingestion and analysis.
+
+Text is normalized chunk by chunk (one PDF page or DOCX paragraph at a
+time) so no full-size intermediate copies are built. Each stage carries
+just enough state across chunk boundaries for the joined output to be
+identical to running the equivalent whole-string regex passes:
+
+- sanitized form: collapse whitespace, drop disallowed characters, strip
+- normalized form: the sanitized form lowercased, with disallowed
+  characters dropped, whitespace collapsed and stripped again; this is the
+  analysis-ready text
+"""
+import re
+from typing import Iterable, List, Tuple
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_DISALLOWED_RE = re.compile(r'[^\w\s.\-,;:()\[\]{}\'\"?!@#$%^&*+=]')
+
+
+class _CollapseWhitespace:
+    """Replace whitespace runs with a single space, across chunks."""
+
+    def __init__(self):
+        self._in_whitespace = False
+
+    def feed(self, chunk: str) -> str:
+        if not chunk:
+            return ''
+        out = _WHITESPACE_RE.sub(' ', chunk)
+        if self._in_whitespace and out.startswith(' '):
+            out = out[1:]
+        self._in_whitespace = chunk[-1].isspace()
+        return out
+
+    def finish(self) -> str:
+        return ''
+
+
+class _DropDisallowed:
+    """Remove characters outside the allowed set; needs no state."""
+
+    def feed(self, chunk: str) -> str:
+        return _DISALLOWED_RE.sub('', chunk)
+
+    def finish(self) -> str:
+        return ''
+
+
+class _Strip:
+    """Strip leading and trailing whitespace of the whole stream."""
+
+    def __init__(self):
+        self._started = False
+        self._pending = ''
+
+    def feed(self, chunk: str) -> str:
+        if not self._started:
+            chunk = chunk.lstrip()
+            if not chunk:
+                return ''
+            self._started = True
+        text = self._pending + chunk
+        body = text.rstrip()
+        # Trailing whitespace is only emitted once more text follows it
+        self._pending = text[len(body):]
+        return body
+
+    def finish(self) -> str:
+        return ''
+
+
+class _Lowercase:
+    """
+    Lowercase text across chunks.
+
+    ``str.lower`` is context-sensitive for the Greek capital sigma, whose
+    form depends on neighbouring letters. The trailing word of each chunk
+    is held back until whitespace follows it, since whitespace ends that
+    context.
+    """
+
+    def __init__(self):
+        self._tail = ''
+
+    def feed(self, chunk: str) -> str:
+        text = self._tail + chunk
+        cut = len(text)
+        while cut and not text[cut - 1].isspace():
+            cut -= 1
+        self._tail = text[cut:]
+        return text[:cut].lower()
+
+    def finish(self) -> str:
+        tail, self._tail = self._tail, ''
+        return tail.lower()
+
+
+class _Pipeline:
+    """Chain of stages, each fed the output of the previous one."""
+
+    def __init__(self, *stages):
+        self.stages = stages
+
+    def feed(self, chunk: str) -> str:
+        for stage in self.stages:
+            chunk = stage.feed(chunk)
+        return chunk
+
+    def finish(self) -> str:
+        out = ''
+        for stage in self.stages:
+            out = stage.feed(out) + stage.finish()
+        return out
+
+
+def _sanitize_pipeline() -> _Pipeline:
+    return _Pipeline(_CollapseWhitespace(), _DropDisallowed(), _Strip())
+
+
+def _clean_pipeline() -> _Pipeline:
+    return _Pipeline(_Lowercase(), _DropDisallowed(), _CollapseWhitespace(), _Strip())
+
+
+class TextNormalizer:
+    """
+    Produce the sanitized and normalized forms of a text in one pass.
+
+    Feed chunks in order with ``feed`` and call ``finish`` once at the end;
+    the joined outputs equal ``sanitize_text(text)`` and
+    ``clean_text(sanitize_text(text))`` for the concatenated chunks.
+    """
+
+    def __init__(self):
+        self._sanitize = _sanitize_pipeline()
+        self._clean = _clean_pipeline()
+        self._sanitized: List[str] = []
+        self._normalized: List[str] = []
+
+    def feed(self, chunk: str):
+        """Normalize the next chunk of text."""
+        sanitized = self._sanitize.feed(chunk)
+        self._sanitized.append(sanitized)
+        self._normalized.append(self._clean.feed(sanitized))
+
+    def finish(self) -> Tuple[str, str]:
+        """
+        Flush buffered text.
+
+        Returns:
+            Tuple of (sanitized text, normalized text)
+        """
+        sanitized = self._sanitize.finish()
+        self._sanitized.append(sanitized)
+        self._normalized.append(self._clean.feed(sanitized))
+        self._normalized.append(self._clean.finish())
+        return ''.join(self._sanitized), ''.join(self._normalized)
+
+
+def normalize_chunks(chunks: Iterable[str]) -> Tuple[str, str]:
+    """
+    Normalize text produced in chunks.
+
+    Args:
+        chunks: Text chunks in document order
+
+    Returns:
+        Tuple of (sanitized text, normalized text)
+    """
+    normalizer = TextNormalizer()
+    for chunk in chunks:
+        normalizer.feed(chunk)
+    return normalizer.finish()
+
+
+def sanitize(text: str) -> str:
+    """Collapse whitespace, drop disallowed characters and strip."""
+    pipeline = _sanitize_pipeline()
+    return pipeline.feed(text) + pipeline.finish()
+
+
+def normalize(text: str) -> str:
+    """Lowercase, drop disallowed characters, collapse whitespace and strip."""
+    pipeline = _clean_pipeline()
+    return pipeline.feed(text) + pipeline.finish()
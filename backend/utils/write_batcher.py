@@ -0,0 +1,117 @@
+"""
+Group-commit writer that batches database writes from concurrent requests.
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class WriteBatcher:
+    """
+    Collect write operations and commit them together in one transaction.
+
+    Each operation is a callable that receives a session and returns a value.
+    Operations are flushed every ``interval_ms`` milliseconds or once
+    ``max_rows`` are pending, whichever comes first. Callers wait on the
+    future returned by ``submit`` until their own write is committed.
+    """
+
+    def __init__(self, session_factory, interval_ms=10, max_rows=100):
+        self.session_factory = session_factory
+        self.interval = interval_ms / 1000.0
+        self.max_rows = max_rows
+        self._queue = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name='write-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, operation):
+        """
+        Queue a write operation.
+
+        Args:
+            operation: Callable taking a session and returning a result
+
+        Returns:
+            Future resolved with the operation's result after commit
+
+        Raises:
+            RuntimeError: If the batcher has been closed
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('WriteBatcher is closed')
+            self._queue.put((operation, future))
+        return future
+
+    def close(self):
+        """Flush pending writes and stop the writer thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self):
+        """Writer loop: gather a batch, then flush it."""
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.interval
+            while len(batch) < self.max_rows:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+
+    def _flush(self, batch):
+        """Commit a batch in one transaction, isolating failures if needed."""
+        session = self.session_factory()
+        try:
+            results = [operation(session) for operation, _ in batch]
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            session.close()
+            logger.warning(f"Batched commit of {len(batch)} writes failed, retrying individually: {e}")
+            for item in batch:
+                self._flush_one(item)
+            return
+        session.close()
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def _flush_one(self, item):
+        """Commit a single write in its own transaction."""
+        operation, future = item
+        session = self.session_factory()
+        try:
+            result = operation(session)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+        finally:
+            session.close()